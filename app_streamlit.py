@@ -1,24 +1,43 @@
 # app_streamlit.py
 
+import hashlib
 import os
 import sys
-import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
 import pandas as pd
 import streamlit as st
+import tiktoken
 from dotenv import load_dotenv
 
-# Allow importing build_tables.py from src/
-sys.path.append("src")
+# Filtered tables are row selections of the cached ones; with copy-on-write they
+# share data until something writes to them, instead of being copied defensively.
+pd.options.mode.copy_on_write = True
 
-try:
-    import build_tables
-except Exception as e:
+# Allow importing build_tables.py from src/ (the script reruns, so only add it once)
+SRC_DIR = str(Path(__file__).parent / "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+def import_build_tables():
+    """
+    Import build_tables.py on first use instead of at the top of the script,
+    so the title renders before requests & co. are loaded.
+    """
+    try:
+        import build_tables
+    except Exception as e:
         st.error(f"Failed to import build_tables.py: {e}")
-        build_tables = None
+        return None
+    return build_tables
 
 # Optional: OpenAI client
 try:
-    from openai import OpenAI
+    import httpx
+    from openai import DefaultHttpxClient, OpenAI
 except Exception:
     OpenAI = None
 
@@ -26,7 +45,10 @@ except Exception:
 # ================================
 # Unified Secrets: st.secrets (Cloud) OR .env (local)
 # ================================
-load_dotenv()
+# Streamlit re-executes this script on every interaction; parse .env once per process.
+if not os.environ.get("_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["_DOTENV_LOADED"] = "1"
 
 
 def get_secret(key: str, default=None):
@@ -48,7 +70,39 @@ def get_secret(key: str, default=None):
 
 OPENAI_API_KEY = get_secret("OPENAI_API_KEY")
 MODEL = get_secret("LLM_MODEL", "gpt-4.1-mini")
-MAX_CHARS_IN_PROMPT = int(get_secret("MAX_CHARS_IN_PROMPT", "1000000"))  # for safety
+# MAX_TOKENS_IN_PROMPT replaced the character-based MAX_CHARS_IN_PROMPT; the old
+# key is still honoured (~4 characters per token) if the new one is not set
+MAX_CHARS_IN_PROMPT = get_secret("MAX_CHARS_IN_PROMPT")
+MAX_TOKENS_IN_PROMPT = int(
+    get_secret("MAX_TOKENS_IN_PROMPT")
+    or (int(MAX_CHARS_IN_PROMPT) // 4 if MAX_CHARS_IN_PROMPT else 250000)
+)
+MAX_OUTPUT_TOKENS = 1200  # per question
+MAX_QUESTIONS = 5  # per request; further lines are dropped (answer and data budget grow per question)
+ANSWER_CACHE_SIZE = 128  # answered prompts kept in memory (see get_answer_cache)
+
+# Columns sent to the LLM (ids, timestamps and flags only cost tokens)
+LLM_PLAYER_COLS = ["name", "season", "goals", "assists", "own_goals", "matches_played"]
+LLM_MATCH_COLS = ["match_key", "season", "item_event_date", "team_home", "team_away", "home_score", "away_score"]
+LLM_EVENT_COLS = ["match_key", "season", "score_time", "scoring_team", "scorer_name", "assist_name", "own_goal_name"]
+
+# Context window per model (prompt + completion), used for the token budget
+MODEL_CTX = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-4.1-mini": 1047576,
+    "gpt-4.1-nano": 1047576,
+}
+
+# Max completion tokens per model: the API rejects a larger max_tokens
+MODEL_MAX_OUTPUT = {
+    "gpt-4o": 16384,
+    "gpt-4o-mini": 16384,
+    "gpt-4.1": 32768,
+    "gpt-4.1-mini": 32768,
+    "gpt-4.1-nano": 32768,
+}
 
 
 # ================================
@@ -81,24 +135,81 @@ if OPENAI_API_KEY is None:
 # ================================
 # Cached loader for combined tables
 # ================================
-@st.cache_data(show_spinner=True)
-def load_combined_tables(download_2526: bool):
+def downcast_ints(df: pd.DataFrame) -> pd.DataFrame:
+    """int64 columns to int32 where the values fit (ids and counts here are small)."""
+    info = np.iinfo(np.int32)
+    small = {
+        col: "int32[pyarrow]"
+        for col in df.columns
+        if str(df[col].dtype) == "int64[pyarrow]"
+        and (df[col].isna().all() or (df[col].min() >= info.min and df[col].max() <= info.max))
+    }
+    return df.astype(small) if small else df
+
+
+def season_files_version() -> tuple:
+    """(file name, mtime) of the local season files — changes whenever one is rewritten."""
+    return tuple(sorted((p.name, p.stat().st_mtime_ns) for p in Path("data").glob("season_*.json")))
+
+
+@st.cache_data(show_spinner=True, max_entries=4)
+def load_combined_tables(data_version: tuple):
     """
-    Load combined tables.
-    - download_2526=True → download & refresh 25/26
-    - download_2526=False → use local files only
+    Load combined tables from the local season files.
+    (The refresh button downloads 25/26 into its local file first.)
+
+    Keyed on data_version (see season_files_version), so a rewritten season
+    file is picked up without clearing caches by hand.
+    In memory only: evicted versions are dropped, and a restarted container
+    skips the JSON parsing anyway through build_tables' own table cache.
     """
+    build_tables = import_build_tables()
     if build_tables is None:
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.NaT
 
     # call your updated build_tables main()
-    res = build_tables.main(download_2526=download_2526)
+    res = build_tables.main(download_2526=False)
 
     player_stats_all = res.get("player_stats_all", pd.DataFrame())
     matches_all = res.get("matches_all", pd.DataFrame())
     events_all = res.get("events_all", pd.DataFrame())
 
-    return player_stats_all, matches_all, events_all
+    # build_tables already returns Arrow-backed columns; only narrow the ints
+    player_stats_all = downcast_ints(player_stats_all)
+    matches_all = downcast_ints(matches_all)
+    events_all = downcast_ints(events_all)
+
+    # Few distinct seasons: categorical codes make the per-rerun season filter cheap
+    for df in (player_stats_all, matches_all, events_all):
+        if "season" in df.columns:
+            df["season"] = df["season"].astype("category")
+    # Plain numpy bool: the exclude filter reads it with a zero-copy .to_numpy()
+    if "exclude_from_statistics" in player_stats_all.columns:
+        player_stats_all["exclude_from_statistics"] = (
+            player_stats_all["exclude_from_statistics"].fillna(False).astype(np.bool_)
+        )
+
+    # Drop events without a match once here. Matches are only filtered by season,
+    # so the season filter alone then keeps events and matches consistent.
+    if (
+        not events_all.empty
+        and not matches_all.empty
+        and "match_key" in events_all.columns
+        and "match_key" in matches_all.columns
+    ):
+        match_keys = pd.MultiIndex.from_arrays([matches_all["season"], matches_all["match_key"]])
+        event_keys = pd.MultiIndex.from_arrays([events_all["season"], events_all["match_key"]])
+        events_all = events_all[event_keys.isin(match_keys)]
+
+    # Parse the match dates once here instead of on every rerun
+    if "item_event_date" in matches_all.columns:
+        last_game = pd.to_datetime(
+            matches_all["item_event_date"], errors="coerce", utc=True, format="ISO8601"
+        ).max()
+    else:
+        last_game = pd.NaT
+
+    return player_stats_all, matches_all, events_all, last_game
 
 
 # ================================
@@ -116,23 +227,28 @@ with st.sidebar:
         """
     )
 
-    # Clear cache so refresh loads immediately
-    if refresh_clicked:
-        try:
-            load_combined_tables.clear()
-        except Exception:
-            st.cache_data.clear()
-
+    data_version = season_files_version()
     with st.spinner("Loading data..."):
-        player_stats_all, matches_all, events_all = load_combined_tables(
-            download_2526=refresh_clicked
-        )
+        player_stats_all, matches_all, events_all, last_game_ts = load_combined_tables(data_version)
+
+    # Download 25/26; its file is only rewritten if the data changed, and the
+    # new mtime then keys a rebuild of every data cache.
+    build_tables = import_build_tables() if refresh_clicked else None
+    if build_tables is not None:
+        with st.spinner("Downloading 25/26 data..."):
+            refreshed = build_tables.refresh_season("25/26")
+        if refreshed is None:
+            st.error("❌ Download of 25/26 failed, showing the local data.")
+        elif refreshed:
+            data_version = season_files_version()
+            player_stats_all, matches_all, events_all, last_game_ts = load_combined_tables(data_version)
+        else:
+            st.caption("No changes since the last refresh.")
 
     if player_stats_all.empty or matches_all.empty:
         st.error("❌ Could not load tables.")
     else:
-        dates = pd.to_datetime(matches_all["item_event_date"], errors="coerce").dropna()
-        last_game = dates.max().strftime("%d.%m.%Y") if len(dates) else "unknown"
+        last_game = last_game_ts.strftime("%d.%m.%Y") if pd.notna(last_game_ts) else "unknown"
         st.caption(f"📅 Last game: **{last_game}**")
 
 
@@ -192,79 +308,66 @@ else:
 # ================================
 # Build filtered tables based on filters
 # ================================
-if not player_stats_all.empty:
-    player_stats = player_stats_all[player_stats_all["season"].isin(seasons_selected)].copy()
-else:
-    player_stats = pd.DataFrame()
+def season_mask(df: pd.DataFrame, seasons) -> np.ndarray | None:
+    """
+    Boolean mask of rows whose categorical `season` is in `seasons`,
+    or None if every season is selected (nothing to filter).
+    """
+    codes = df["season"].cat.categories.get_indexer(seasons)
+    codes = codes[codes >= 0]
+    if len(np.unique(codes)) == len(df["season"].cat.categories):
+        return None
+    return np.isin(df["season"].cat.codes.to_numpy(), codes)
 
-if not matches_all.empty:
-    matches = matches_all[matches_all["season"].isin(seasons_selected)].copy()
-else:
-    matches = pd.DataFrame()
 
-if not events_all.empty:
-    events = events_all[events_all["season"].isin(seasons_selected)].copy()
-else:
-    events = pd.DataFrame()
-
-# Apply "exclude_from_statistics" flag only to player_stats
-if (
-    exclude_flag
-    and not player_stats.empty
-    and "exclude_from_statistics" in player_stats.columns
-):
-    player_stats = player_stats[player_stats["exclude_from_statistics"] == False]
-
-# Keep only events that belong to the filtered matches (via match_key, if present)
-if (
-    not events.empty
-    and not matches.empty
-    and "match_key" in events.columns
-    and "match_key" in matches.columns
-):
-    events = events.merge(
-        matches[["season", "match_key"]].drop_duplicates(),
-        on=["season", "match_key"],
-        how="inner",
-    )
+def take_rows(df: pd.DataFrame, mask: np.ndarray | None) -> pd.DataFrame:
+    """Rows of `df` selected by `mask` (the frame itself if there is no mask or all rows match)."""
+    return df if mask is None or mask.all() else df[mask]
 
 
-# ================================
-# Ask Question — form so Enter submits
-# ================================
-with st.form("question_form"):
-    question = st.text_input(
-        "Example: 'Who is the top scorer?', 'How many matches ended in a draw?', "
-        "'Show all players with >5 goals', 'Show all goals in the last match with minute, scorer and assist.'"
-    )
-    submitted = st.form_submit_button("Ask your question")
+def filter_tables(ps_all, ms_all, ev_all, seasons, exclude):
+    """Apply the season + exclude_from_statistics filters to the combined tables."""
+    ps, ms, ev = ps_all, ms_all, ev_all
 
+    # One fused mask per table instead of a chain of intermediate frames;
+    # with every season selected (the default) only the exclude flag is applied
+    if not ps.empty:
+        ps_mask = season_mask(ps, seasons)
+        if exclude and "exclude_from_statistics" in ps.columns:
+            excluded = ps["exclude_from_statistics"].to_numpy()
+            ps_mask = ~excluded if ps_mask is None else ps_mask & ~excluded
+        ps = take_rows(ps, ps_mask)
 
-# ================================
-# LLM Helper: extract text safely
-# ================================
-def extract_assistant_text(resp):
-    """Handles all possible formats of OpenAI responses."""
-    try:
-        choice = resp.choices[0]
-    except Exception:
-        return str(resp)
+    if not ms.empty:
+        ms = take_rows(ms, season_mask(ms, seasons))
 
-    msg = getattr(choice, "message", None)
+    # Events without a match were dropped in load_combined_tables, so the
+    # season filter keeps exactly the events of the filtered matches
+    if not ev.empty:
+        ev = take_rows(ev, season_mask(ev, seasons))
 
-    if msg is not None:
-        if isinstance(msg, dict):
-            return msg.get("content", str(msg))
-        if hasattr(msg, "content"):
-            return msg.content
+    return ps, ms, ev
 
-    if hasattr(choice, "text"):
-        return choice.text
 
-    try:
-        return choice["message"]["content"]
-    except Exception:
-        return str(resp)
+@st.cache_data(max_entries=8, ttl=6 * 3600, show_spinner=False)
+def get_full_filtered(seasons: tuple, exclude: bool, data_version: tuple):
+    """Full filtered tables — only needed for the LLM prompt and its size report."""
+    ps_all, ms_all, ev_all, _ = load_combined_tables(data_version)
+    return filter_tables(ps_all, ms_all, ev_all, list(seasons), exclude)
+
+
+@st.cache_data(max_entries=8, ttl=6 * 3600, show_spinner=False)
+def get_preview(seasons: tuple, exclude: bool, data_version: tuple, n: int = 5):
+    """First `n` rows of each filtered table plus the full row counts."""
+    ps, ms, ev = get_full_filtered(seasons, exclude, data_version)
+    return ps.head(n), ms.head(n), ev.head(n), (len(ps), len(ms), len(ev))
+
+
+# Hashable cache key for every filtered helper (cached functions never take DataFrames);
+# sorted so the multiselect order does not create duplicate cache entries,
+# and carrying the data version so new season files invalidate them
+filter_key = (tuple(sorted(seasons_selected)), exclude_flag, data_version)
+_, _, _, (n_player_stats, n_matches, _) = get_preview(*filter_key)
 
 
 # ================================
@@ -272,18 +375,25 @@ def extract_assistant_text(resp):
 # ================================
 SYSTEM_INSTRUCTIONS = """
 You are a careful football data analyst.
-You will receive three JSON tables: player_stats, matches and events.
+You will receive CSV tables. Each table starts with a "### <table name>" line followed by its header row.
 
 TABLES:
+- top_scorers, top_assisters, results_per_season, score_distribution:
+  pre-computed summaries over all selected seasons; top_scorers and
+  top_assisters rank the players within each season (season column)
 - player_stats: per-player statistics by season
 - matches: per match, with score and metadata
-- events: one row per goal (time, scorer, assist, own goal, match reference)
+- events: one row per goal (time, scoring team, scorer, assist, own goal, match reference), newest match first
 
 RULES:
 - Use ONLY the provided data for anything factual.
 - You ARE allowed to propose groupings or divisions of players into teams, even if such teams do not exist in the raw data.
 - When creating teams, distribute players fairly based on available statistics.
 - If something is factually missing (goals, matches, etc.), say so.
+- Prefer the summaries for per-season totals and rankings; use the raw tables for details.
+- "This season" means the latest season in the data; add up seasons only when asked for totals across seasons.
+- If the data ends with "### _truncated", the last rows (the oldest events) were cut off; mention it when it matters.
+- If several questions are given (Q1, Q2, ...), answer each one under a heading with its label.
 - Be concise.
 - Ignore the shortened surname (e.g., “Artem M.”) and treat it as the full first name (Artem), unless there are multiple players with the same first name.
 """
@@ -297,73 +407,357 @@ Examples:
 """
 
 
-def build_json_payload(ps: pd.DataFrame, ms: pd.DataFrame, ev: pd.DataFrame):
-    payload = {
-        "player_stats": ps.to_dict(orient="records"),
-        "matches": ms.to_dict(orient="records"),
-        "events": ev.to_dict(orient="records"),
-    }
-    text = json.dumps(payload, ensure_ascii=False)
+@st.cache_resource
+def get_encoder(model: str):
+    """Load the tiktoken encoding for `model` once per process."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def split_questions(text: str) -> list:
+    """One question per non-empty line."""
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def answer_token_limit(questions: list) -> int:
+    """max_tokens for one request: MAX_OUTPUT_TOKENS per question, within the model's output limit."""
+    return min(MAX_OUTPUT_TOKENS * max(len(questions), 1), MODEL_MAX_OUTPUT.get(MODEL, 16384))
 
-    if len(text) > MAX_CHARS_IN_PROMPT:
-        # naive truncation to stay under limit
-        return text[: MAX_CHARS_IN_PROMPT - 50] + '..."TRUNCATED"]}', True
 
-    return text, False
+def build_user_content(tables_data: str, questions: list) -> str:
+    if len(questions) == 1:
+        asked = f"User question: {questions[0]}"
+    else:
+        asked = "User questions:\n" + "\n".join(f"Q{i}: {q}" for i, q in enumerate(questions, start=1))
+    return (
+        "DATA_START\n"
+        + tables_data
+        + "\nDATA_END\n\n"
+        + asked
+    )
+
+
+def prompt_token_budget(questions: list) -> int:
+    """
+    Tokens left for the data tables:
+    context window (capped by MAX_TOKENS_IN_PROMPT, minus a 10% buffer)
+    minus system prompt, questions and the reserved answer tokens (per question).
+    """
+    enc = get_encoder(MODEL)
+    overhead = len(enc.encode(SYSTEM_INSTRUCTIONS + EXAMPLES + build_user_content("", questions)))
+    context = min(MODEL_CTX.get(MODEL, 128000), MAX_TOKENS_IN_PROMPT)
+    return max(int(context * 0.9) - overhead - answer_token_limit(questions), 0)
+
+
+@st.cache_data(max_entries=8, ttl=6 * 3600, show_spinner=False)
+def build_summaries(seasons: tuple, exclude: bool, data_version: tuple):
+    """
+    Small aggregate tables that answer the common questions
+    (top scorer, draws, results) without reading the row-level data.
+    """
+    ps, ms, _ = get_full_filtered(seasons, exclude, data_version)
+    summaries = {}
+
+    if not ps.empty:
+        # Per season: "this season" questions must not see cross-season sums
+        totals = ps.groupby(["season", "name"], observed=True, as_index=False)[
+            ["goals", "assists", "own_goals", "matches_played"]
+        ].sum()
+        totals["goals_per_match"] = (totals["goals"] / totals["matches_played"].where(totals["matches_played"] > 0)).round(2)
+
+        def top_per_season(by: list) -> pd.DataFrame:
+            ranked = totals.sort_values(["season", *by], ascending=[True] + [False] * len(by))
+            return ranked.groupby("season", observed=True).head(20)
+
+        summaries["top_scorers"] = top_per_season(["goals", "assists"])
+        summaries["top_assisters"] = top_per_season(["assists", "goals"])
+
+    if not ms.empty:
+        scored = ms.dropna(subset=["home_score", "away_score"])
+        home, away = scored["home_score"].astype(int), scored["away_score"].astype(int)
+        summaries["results_per_season"] = (
+            scored.assign(
+                home_win=home > away,
+                away_win=home < away,
+                draw=home == away,
+                goals=home + away,
+            )
+            .groupby("season", observed=True, as_index=False)
+            .agg(
+                matches=("match_key", "count"),
+                home_wins=("home_win", "sum"),
+                away_wins=("away_win", "sum"),
+                draws=("draw", "sum"),
+                goals=("goals", "sum"),
+            )
+        )
+        summaries["score_distribution"] = (
+            (home.astype(str) + ":" + away.astype(str)).value_counts().rename_axis("score").reset_index()
+        )
+
+    return summaries
 
 
-def call_llm(question, ps, ms, ev):
+def llm_columns(df: pd.DataFrame, cols: list) -> pd.DataFrame:
+    return df[[c for c in cols if c in df.columns]]
+
+
+def llm_events(ev: pd.DataFrame) -> pd.DataFrame:
+    """Events projected for the prompt, with the scoring team id resolved to its name."""
+    if {"score_team_id", "team_home_id", "team_home", "team_away"} <= set(ev.columns):
+        is_home = (ev["score_team_id"] == ev["team_home_id"]).fillna(False).astype(bool)
+        ev = ev.assign(scoring_team=ev["team_home"].where(is_home, ev["team_away"]))
+    return llm_columns(ev, LLM_EVENT_COLS)
+
+
+def csv_section(name: str, df: pd.DataFrame):
+    """'### name' + CSV header line, and the data rows of `df` as CSV lines."""
+    lines = df.to_csv(index=False, lineterminator="\n").splitlines() if not df.columns.empty else [""]
+    return f"### {name}\n{lines[0]}", lines[1:]
+
+
+@st.cache_resource(max_entries=8, ttl=6 * 3600, show_spinner=False)
+def serialize_filtered(seasons: tuple, exclude: bool, data_version: tuple):
+    """
+    Serialize the filtered tables once per filter combination.
+
+    Takes hashable filter keys (not DataFrames) and re-applies the filters to the
+    cached combined tables. CSV instead of JSON records: column names appear
+    once per table, not on every row. Returns the summaries CSV, the section
+    header and data rows of each table, and the cumulative token count
+    (summaries and headers first, then the rows of player_stats, matches and events).
+
+    cache_resource, not cache_data: every question reads the whole result, and
+    cache_data would unpickle a fresh copy of all rows on each hit. The result
+    is shared, so callers must treat it as read-only.
+    """
+    ps, ms, ev = get_full_filtered(seasons, exclude, data_version)
+    summaries = build_summaries(seasons, exclude, data_version)
+
+    ps = llm_columns(ps, LLM_PLAYER_COLS)
+    ms = llm_columns(ms, LLM_MATCH_COLS)
+    # Newest match first: truncation cuts from the tail, so it drops the oldest events
+    if {"item_event_date", "score_time"} <= set(ev.columns):
+        ev = ev.sort_values(["item_event_date", "score_time"], ascending=[False, True], kind="stable")
+    ev = llm_events(ev)
+
+    summaries_csv = "\n".join(
+        "\n".join([header, *rows]) for header, rows in (csv_section(name, df) for name, df in summaries.items())
+    )
+
+    headers, rows = {}, {}
+    for name, df in (("player_stats", ps), ("matches", ms), ("events", ev)):
+        headers[name], rows[name] = csv_section(name, df)
+
+    enc = get_encoder(MODEL)
+    # +1 per line for the newline
+    fixed = summaries_csv + "\n" + "\n".join(headers.values())
+    counts = [len(enc.encode_ordinary(fixed)) + 1]
+    for table_rows in rows.values():
+        counts.extend(len(tokens) + 1 for tokens in enc.encode_ordinary_batch(table_rows))
+
+    return summaries_csv, headers, rows, np.cumsum(counts, dtype=np.int64)
+
+
+def build_csv_payload(summaries_csv: str, headers: dict, rows: dict, token_prefix: np.ndarray, budget: int):
+    """
+    Assemble the prompt data from pre-serialized parts within the token budget.
+    Summaries and table headers come first so they survive truncation; whole
+    rows are dropped from the tail, and a final "### _truncated" line tells
+    the model that rows are missing.
+
+    Returns (csv_text, truncated, n_tokens); nothing is re-encoded here, the
+    cut-off and token count come from a binary search over the prefix sums.
+    """
+    n_keep = int(np.searchsorted(token_prefix, budget, side="right"))
+    truncated = n_keep < len(token_prefix)
+    n_tokens = int(token_prefix[n_keep - 1]) if n_keep else 0
+
+    if not n_keep:
+        return "### _truncated", truncated, n_tokens
+    n_keep -= 1
+
+    parts = [summaries_csv] if summaries_csv else []
+    for name, table_rows in rows.items():
+        kept = table_rows[:n_keep]
+        n_keep -= len(kept)
+        parts.append("\n".join([headers[name], *kept]))
+
+    if truncated:
+        parts.append("### _truncated")
+
+    return "\n".join(parts), truncated, n_tokens
+
+
+@st.cache_data(max_entries=8, ttl=6 * 3600, show_spinner=False)
+def prompt_size_report(seasons: tuple, exclude: bool, data_version: tuple, budget: int) -> dict:
+    """
+    Character sizes of the prompt data for the "Prompt size" expander.
+
+    Cached per filter and budget, so reruns (typing, expanding sections) only
+    do a lookup. Reuses the rows from serialize_filtered instead of
+    serializing the tables again.
+    """
+    tables = serialize_filtered(seasons, exclude, data_version)
+    summaries_csv, headers, rows, token_prefix = tables
+
+    # header line + one line per row, newline-separated
+    sizes = {name: len(headers[name]) + sum(map(len, rows[name])) + len(rows[name]) for name in rows}
+    sizes["summaries"] = len(summaries_csv)
+
+    # Full size from the part sizes (parts are joined by newlines) instead of building the text;
+    # only a truncated payload has to be assembled to be measured
+    parts = [size for name, size in sizes.items() if name != "summaries" or size]
+    sizes["full"] = sum(parts) + len(parts) - 1
+
+    if budget >= token_prefix[-1]:
+        sizes.update(sent=sizes["full"], sent_tokens=int(token_prefix[-1]), truncated=False)
+    else:
+        sent_csv, truncated, sent_tokens = build_csv_payload(*tables, budget)
+        sizes.update(sent=len(sent_csv), sent_tokens=sent_tokens, truncated=truncated)
+    return sizes
+
+
+@st.cache_resource
+def get_openai_client():
+    """One client (and connection pool) per process, reused across questions and sessions."""
+    # httpx drops idle connections after 5 s by default; keep them for a few minutes
+    # so a follow-up question skips the TCP/TLS handshake.
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300.0)
+    )
+    # The SDK retries 429/5xx/connection errors with exponential backoff itself;
+    # one extra attempt over its default before the error reaches the user.
+    return OpenAI(api_key=OPENAI_API_KEY, timeout=60, max_retries=3, http_client=http_client)
+
+
+@st.cache_resource
+def get_answer_cache() -> tuple:
+    """
+    Finished answers by prompt hash, shared across reruns and sessions,
+    so the same questions on the same data skip the API call.
+    Oldest entries are evicted beyond ANSWER_CACHE_SIZE.
+    Returns (answers, lock): sessions run in their own threads, so every
+    access goes through the lock.
+    """
+    return OrderedDict(), threading.Lock()
+
+
+class PromptBudgetError(RuntimeError):
+    """The token budget leaves no room for any data, so the model is not called."""
+
+
+def call_llm(questions, tables):
+    """
+    Ask all `questions` in one request: the data tables are sent (and billed) once,
+    and the answers come back in a single stream, one heading per question.
+    """
     if OpenAI is None:
         raise RuntimeError("OpenAI client not installed.")
 
     if not OPENAI_API_KEY:
         raise RuntimeError("OPENAI_API_KEY is not set.")
 
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    budget = prompt_token_budget(questions)
+    tables_csv, truncated, n_tokens = build_csv_payload(*tables, budget)
+    if not n_tokens:
+        # Not even the summaries and table headers fit: the model would get no data
+        raise PromptBudgetError(
+            f"Prompt budget too small for any data ({budget:,} tokens). "
+            "Raise MAX_TOKENS_IN_PROMPT or ask fewer questions at once."
+        )
 
-    tables_json, truncated = build_json_payload(ps, ms, ev)
+    user_content = build_user_content(tables_csv, questions)
 
-    user_content = (
-        "DATA_START\n"
-        + tables_json
-        + "\nDATA_END\n\n"
-        f"User question: {question}"
-    )
+    answers, answers_lock = get_answer_cache()
+    prompt_hash = hashlib.blake2b(
+        "\0".join([MODEL, SYSTEM_INSTRUCTIONS + EXAMPLES, user_content]).encode(), digest_size=16
+    ).hexdigest()
+    with answers_lock:
+        cached = answers.get(prompt_hash)
+    if cached is not None:
+        return iter([cached]), truncated
 
-    resp = client.chat.completions.create(
+    client = get_openai_client()
+    stream = client.chat.completions.create(
         model=MODEL,
         temperature=0.0,
-        max_tokens=1200,
+        max_tokens=answer_token_limit(questions),
+        stream=True,
         messages=[
             {"role": "system", "content": SYSTEM_INSTRUCTIONS + EXAMPLES},
             {"role": "user", "content": user_content},
         ],
     )
 
-    return extract_assistant_text(resp), truncated, resp
+    def answer_chunks():
+        """Yield the answer text as it arrives; cache it once the stream is complete."""
+        parts = []
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield parts[-1]
+
+        with answers_lock:
+            answers[prompt_hash] = "".join(parts)
+            while len(answers) > ANSWER_CACHE_SIZE:
+                answers.popitem(last=False)
+
+    return answer_chunks(), truncated
 
 
 # ================================
-# Run LLM when form submitted
+# Ask Question — form, Ctrl+Enter submits; one question per line,
+# several questions are answered in one request
+# (a fragment: submitting reruns only this section, not the filters/preview)
 # ================================
-if submitted:
-    if not question.strip():
+@st.fragment
+def ask_section(filter_key: tuple, has_data: bool):
+    with st.form("question_form"):
+        question = st.text_area(
+            "Example: 'Who is the top scorer?', 'How many matches ended in a draw?', "
+            "'Show all players with >5 goals', 'Show all goals in the last match with minute, scorer and assist.'",
+            key="question",
+            height=80,
+            help=f"One question per line; up to {MAX_QUESTIONS} questions are answered in one request.",
+        )
+        submitted = st.form_submit_button("Ask your question")
+
+    if not submitted:
+        return
+
+    questions = split_questions(question)
+    if len(questions) > MAX_QUESTIONS:
+        st.warning(
+            f"Only the first {MAX_QUESTIONS} questions are answered "
+            f"({len(questions)} lines entered); ask the rest separately."
+        )
+        questions = questions[:MAX_QUESTIONS]
+    if not questions:
         st.warning("Please enter a question.")
+    elif not has_data:
+        st.warning("No data available for the selected filters.")
     else:
-        if player_stats.empty or matches.empty:
-            st.warning("No data available for the selected filters.")
-        else:
+        try:
             with st.spinner("Processing your question..."):
-                try:
-                    answer, truncated, raw = call_llm(question, player_stats, matches, events)
-                except Exception as e:
-                    st.error(f"Error while contacting the model: {e}")
-                else:
-                    st.subheader("Answer")
-                    st.write(answer)
+                tables = serialize_filtered(*filter_key)
+                answer_chunks, truncated = call_llm(questions, tables)
+
+            st.subheader("Answer")
+            # write_stream renders tokens as they arrive and returns the full text
+            answer = st.write_stream(answer_chunks)
+        except PromptBudgetError as e:
+            st.error(f"❌ {e}")
+        except Exception as e:
+            st.error(f"Error while contacting the model: {e}")
+        else:
+            if truncated:
+                st.warning("⚠️ Data was truncated before sending to the model.")
+
 
-                    if truncated:
-                        st.warning("⚠️ Data was truncated before sending to the model.")
+ask_section(filter_key, n_player_stats > 0 and n_matches > 0)
 
 
 # ================================
@@ -384,19 +778,26 @@ with st.expander("💬 Sample questions", expanded=False):
 # ================================
 # Show Preview Tables
 # ================================
-with st.expander("🔍 Data preview", expanded=False):
+@st.fragment
+def preview_section(filter_key: tuple):
+    ps_head, ms_head, ev_head, (n_ps, n_ms, n_ev) = get_preview(*filter_key)
+
+    with st.expander("🔍 Data preview", expanded=False):
+
+        st.subheader("Player Stats (Top 5)")
+        st.dataframe(ps_head)
+        st.markdown(f"Rows in player_stats: **{n_ps}**")
 
-    st.subheader("Player Stats (Top 5)")
-    st.dataframe(player_stats.head(5))
-    st.markdown(f"Rows in player_stats: **{len(player_stats)}**")
+        st.subheader("Matches (Top 5)")
+        st.dataframe(ms_head)
+        st.markdown(f"Rows in matches: **{n_ms}**")
 
-    st.subheader("Matches (Top 5)")
-    st.dataframe(matches.head(5))
-    st.markdown(f"Rows in matches: **{len(matches)}**")
+        st.subheader("Events (Top 5)")
+        st.dataframe(ev_head)
+        st.markdown(f"Rows in events: **{n_ev}**")
 
-    st.subheader("Events (Top 5)")
-    st.dataframe(events.head(5))
-    st.markdown(f"Rows in events: **{len(events)}**")
+
+preview_section(filter_key)
 
 
 # ================================
@@ -404,45 +805,25 @@ with st.expander("🔍 Data preview", expanded=False):
 # ================================
 with st.expander("🧪 Prompt size", expanded=False):
     try:
-        # Convert tables individually
-        ps_json = json.dumps(player_stats.to_dict(orient="records"), ensure_ascii=False)
-        ms_json = json.dumps(matches.to_dict(orient="records"), ensure_ascii=False)
-        ev_json = json.dumps(events.to_dict(orient="records"), ensure_ascii=False)
-
-        ps_size = len(ps_json)
-        ms_size = len(ms_json)
-        ev_size = len(ev_json)
-
-        # combined full JSON BEFORE truncation
-        full_json = json.dumps(
-            {
-                "player_stats": player_stats.to_dict(orient="records"),
-                "matches": matches.to_dict(orient="records"),
-                "events": events.to_dict(orient="records"),
-            },
-            ensure_ascii=False,
-        )
-        full_size = len(full_json)
-
-        # JSON AFTER truncation (sent to LLM)
-        sent_json, was_truncated = build_json_payload(player_stats, matches, events)
-        sent_size = len(sent_json)
+        budget = prompt_token_budget(split_questions(st.session_state.get("question", ""))[:MAX_QUESTIONS])
+        sizes = prompt_size_report(*filter_key, budget)
 
         st.subheader("📊 Size per table")
-        st.write(f"🟦 player_stats: {ps_size:,} characters")
-        st.write(f"🟩 matches:      {ms_size:,} characters")
-        st.write(f"🟧 events:       {ev_size:,} characters")
-
-        st.subheader("📦 Combined JSON")
-        st.write(f"📦 Original JSON size: {full_size:,} characters")
-        st.write(f"✉️ Sent JSON size:     {sent_size:,} characters")
-        st.write(f"📉 Max allowed size:   {MAX_CHARS_IN_PROMPT:,} characters")
-        st.write(f"🔢 Approx tokens sent: {sent_size / 4:,.0f}")
-
-        if was_truncated:
-            st.error("⚠️ JSON WAS TRUNCATED before sending to the model!")
+        st.write(f"🟦 player_stats: {sizes['player_stats']:,} characters")
+        st.write(f"🟩 matches:      {sizes['matches']:,} characters")
+        st.write(f"🟧 events:       {sizes['events']:,} characters")
+        st.write(f"🟪 summaries:    {sizes['summaries']:,} characters")
+
+        st.subheader("📦 Combined prompt data")
+        st.write(f"📦 Original CSV size: {sizes['full']:,} characters")
+        st.write(f"✉️ Sent CSV size:     {sizes['sent']:,} characters")
+        st.write(f"🔢 Tokens sent:        {sizes['sent_tokens']:,} tokens")
+        st.write(f"📉 Token budget:       {budget:,} tokens")
+
+        if sizes["truncated"]:
+            st.error("⚠️ DATA WAS TRUNCATED before sending to the model!")
         else:
-            st.success("✅ Full JSON sent (no truncation).")
+            st.success("✅ Full data sent (no truncation).")
 
     except Exception as e:
-        st.error(f"Error calculating JSON sizes: {e}")
+        st.error(f"Error calculating prompt sizes: {e}")
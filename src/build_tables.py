@@ -1,11 +1,19 @@
 # src/build_tables.py
+import hashlib
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any
 
+import numpy as np
+import orjson
+import pyarrow as pa
 import requests
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 # -------------------------------------------------
 # Season config: URLs + local JSON targets
 # -------------------------------------------------
@@ -20,8 +28,31 @@ SEASONS = {
     },
 }
 
-# Ensure data dir exists
-Path("data").mkdir(parents=True, exist_ok=True)
+# One session for all downloads: keeps the TLS connection alive between
+# seasons and between refreshes from the app
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept": "application/json"})
+
+# Built tables per season file, keyed on the file's mtime + size (see main)
+# and on this module's source, so a change to the builders invalidates them
+CACHE_DIR = Path("data/.cache")
+TABLES_CACHE_VERSION = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+
+# Integer columns of the resp record lists, coerced once in _canonicalize_resp
+INT_COLUMNS = {
+    "matchStatistics": (
+        "playerId", "player_id", "playerID",
+        "score", "isGoal", "Score",
+        "assist", "isAssist", "Assist",
+        "ownGoal", "own_goal", "OwnGoal",
+    ),
+    "itemPlayerHistory": ("playerId", "player_id", "playerID", "soccerMatchId", "itemEventId"),
+    "matchScoreStatistics": (
+        "soccerMatchId", "itemEventId", "scoreTeamId",
+        "teamHomeId", "teamAwayId", "scoreTeamHome", "scoreTeamAway",
+        "scoreById", "assistById", "ownGoalById",
+    ),
+}
 
 
 # -------------------------------------------------
@@ -33,8 +64,50 @@ def _load_local_json(file_path: Path) -> Dict[str, Any] | None:
         print(f"❌ Local file not found: {file_path}")
         return None
     print(f"➡ Using local file {file_path}")
-    with file_path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    return orjson.loads(file_path.read_bytes())
+
+
+def _save_json(data: Dict[str, Any], file_path: Path) -> None:
+    """
+    Write downloaded JSON to file_path. The season files are tracked in git, so this
+    keeps their json.dump(indent=2) format byte for byte (orjson would write
+    non-ASCII names unescaped) and a refresh only diffs what actually changed.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    print(f"✔ Saved to {file_path}")
+
+
+def _tables_cache_file(file_path: Path) -> Path | None:
+    """Cache file for the tables built from file_path; changes whenever the file or the builders do."""
+    if not file_path.exists():
+        return None
+    stat = file_path.stat()
+    return CACHE_DIR / f"{file_path.stem}.{TABLES_CACHE_VERSION}.{stat.st_mtime_ns}_{stat.st_size}.pkl"
+
+
+def _load_cached_tables(cache_file: Path | None):
+    """(player_stats, matches_df, events_df) from cache_file, or None if missing/unreadable."""
+    if cache_file is None or not cache_file.exists():
+        return None
+    try:
+        tables = pd.read_pickle(cache_file)
+    except Exception as e:
+        print(f"⚠ Ignoring unreadable cache {cache_file}: {e}")
+        return None
+    print(f"➡ Using cached tables {cache_file}")
+    return tables
+
+
+def _save_cached_tables(cache_file: Path | None, tables) -> None:
+    """Store tables in cache_file and drop the other entries of the same season file (old file or builder versions)."""
+    if cache_file is None:
+        return
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    stem = cache_file.name.split(".")[0]
+    for old in CACHE_DIR.glob(f"{stem}.*.pkl"):
+        old.unlink(missing_ok=True)
+    pd.to_pickle(tables, cache_file)
 
 
 def download_season_json(
@@ -42,14 +115,17 @@ def download_season_json(
     url: str,
     file_path: Path,
     allow_download: bool,
+    save: bool = True,
+    fallback: bool = True,
 ) -> Dict[str, Any] | None:
     """
     Behavior:
     - If allow_download is False:
         -> Only load from local file_path (no HTTP).
     - If allow_download is True:
-        -> Try HTTP download, save to file_path.
-           On failure, fallback to local file_path if present.
+        -> Try HTTP download, save to file_path (unless save is False).
+           On failure, fallback to local file_path if present
+           (unless fallback is False).
 
     Returns parsed JSON dict or None.
     """
@@ -63,21 +139,47 @@ def download_season_json(
     data = None
 
     try:
-        resp = requests.get(url, timeout=30)
+        resp = _SESSION.get(url, timeout=30)
         resp.raise_for_status()
-        data = resp.json()
-        # save downloaded JSON
-        with file_path.open("w", encoding="utf-8") as fh:
-            json.dump(data, fh, indent=2)
-        print(f"✔ Downloaded and saved to {file_path}")
+        data = orjson.loads(resp.content)
+        print("✔ Downloaded")
+        if save:
+            _save_json(data, file_path)
     except Exception as e:
         print(f"⚠ Download failed for season {season}: {e}")
         # fallback to existing local
-        data = _load_local_json(file_path)
+        data = _load_local_json(file_path) if fallback else None
 
     return data
 
 
+def refresh_season(season: str) -> bool | None:
+    """
+    Download `season` and update its local JSON file if the content changed.
+
+    The API always returns the full season, so the download itself cannot be
+    skipped. The local file is only rewritten (and its mtime only changes)
+    when the downloaded data differs from it, which covers new matches as
+    well as corrections to matches already in the file.
+
+    Returns True if the file was rewritten (rebuild needed), False if it is
+    unchanged, None if the download failed (the local file is kept).
+    """
+    cfg = SEASONS[season]
+    data = download_season_json(
+        season, cfg["url"], cfg["file"], allow_download=True, save=False, fallback=False
+    )
+    if data is None:
+        return None
+
+    if cfg["file"].exists() and orjson.loads(cfg["file"].read_bytes()) == data:
+        print(f"➡ {cfg['file']} is up to date")
+        return False
+
+    _save_json(data, cfg["file"])
+    return True
+
+
 def to_df(obj):
     """Convert list/dict to pandas DataFrame, flattening nested dicts."""
     if obj is None:
@@ -86,50 +188,116 @@ def to_df(obj):
         if len(obj) == 0:
             return pd.DataFrame()
         if isinstance(obj[0], dict):
-            return pd.json_normalize(obj, sep=".")
+            # The API records are flat: the plain constructor is ~2x faster than
+            # json_normalize, which is only needed when something is nested.
+            if any(isinstance(v, dict) for rec in obj for v in rec.values()):
+                return pd.json_normalize(obj, sep=".")
+            return pd.DataFrame(obj)
         return pd.DataFrame(obj)
     if isinstance(obj, dict):
         return pd.json_normalize([obj], sep=".")
     return pd.DataFrame([obj])
 
 
+def _to_int64(values: pd.Series) -> pd.Series:
+    """
+    Coerce to nullable Int64 (unparsable -> NA). Integer columns are wrapped
+    without a copy; float columns become one IntegerArray(data, mask).
+    """
+    num = pd.to_numeric(values, errors="coerce")
+    if isinstance(num.dtype, np.dtype) and num.dtype.kind in "iub":
+        arr = pd.arrays.IntegerArray(num.to_numpy(dtype="int64"), np.zeros(len(num), dtype=bool))
+    elif isinstance(num.dtype, np.dtype) and num.dtype.kind == "f":
+        data = num.to_numpy()
+        mask = np.isnan(data)
+        data = np.where(mask, 0, data)
+        if (data != np.trunc(data)).any():
+            return num.astype("Int64")  # raises on non-integral values, as before
+        arr = pd.arrays.IntegerArray(data.astype("int64"), mask)
+    else:
+        return num.astype("Int64")
+    return pd.Series(arr, index=values.index, name=values.name)
+
+
+def _records_df(resp: Dict[str, Any], key: str) -> pd.DataFrame:
+    """
+    resp[key] as a DataFrame with its INT_COLUMNS as Int64. Reuses the frame
+    of a resp from _canonicalize_resp (shallow copy, so callers may add columns).
+    """
+    obj = resp.get(key)
+    if isinstance(obj, pd.DataFrame):
+        return obj.copy(deep=False)
+    df = to_df(obj)
+    for c in INT_COLUMNS.get(key, ()):
+        if c in df.columns:
+            df[c] = _to_int64(df[c])
+    return df
+
+
+def _canonicalize_resp(resp: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of resp with the record lists the builders share parsed into typed
+    DataFrames once, instead of every builder re-running to_df + to_numeric.
+    """
+    return {**resp, **{key: _records_df(resp, key) for key in INT_COLUMNS}}
+
+
+def _match_keys(soccer_match_id: pd.Series, fallback: pd.Series) -> pd.Series:
+    """
+    Vectorized match key: "s<soccerMatchId>" where the id is set and non-zero,
+    otherwise the given fallback key (built from the item event).
+    """
+    sm = pd.to_numeric(soccer_match_id, errors="coerce")
+    has_sm = sm.notna() & (sm != 0)
+    s_key = "s" + sm.where(has_sm, 0).astype("int64").astype(str)
+    return pd.Series(np.where(has_sm, s_key, fallback), index=sm.index, dtype=object)
+
+
+def _mss_match_keys(mss: pd.DataFrame) -> pd.Series:
+    """
+    match_key per matchScoreStatistics row, shared by build_matches_df and
+    build_scoring_events_df so their keys always agree.
+    """
+    def key_part(col: str) -> pd.Series:
+        return mss[col].astype(str).where(mss[col].notna(), "")
+
+    fallback = (
+        "ie" + key_part("itemEventId")
+        + "_h" + key_part("teamHomeId")
+        + "_a" + key_part("teamAwayId")
+        + "_d" + key_part("itemEventDate")
+    )
+    return _match_keys(mss["soccerMatchId"], fallback)
+
+
 # -------------------------------------------------
 # Players + stats builders
 # -------------------------------------------------
 def build_players_df(resp: Dict[str, Any]) -> pd.DataFrame:
     players = resp.get("players", [])
-    df = to_df(players)
-
-    mapping = {
-        "baseObjectId": "player_id",
-        "name": "name",
-        "excludeFromStatistics": "exclude_from_statistics",
-        "createdTimestamp": "created_ts",
-        "updatedTimestamp": "updated_ts",
-    }
-    present = [c for c in mapping if c in df.columns]
-    if present:
-        players_df = df[present].rename(columns=mapping)
-    else:
-        players_df = pd.DataFrame(columns=list(mapping.values()))
 
-    # types & defaults
-    players_df["player_id"] = pd.to_numeric(players_df.get("player_id", pd.NA), errors="coerce").astype("Int64")
-    players_df["name"] = players_df.get("name", "").fillna("").astype(str)
-    players_df["exclude_from_statistics"] = (
-        players_df.get("exclude_from_statistics", False).fillna(False).astype(bool)
+    def ids(key: str) -> pd.Series:
+        return _to_int64(pd.Series([p.get(key) for p in players], dtype=object))
+
+    # Flat records with known keys: build the columns directly instead of
+    # json_normalize + column select + rename
+    players_df = pd.DataFrame(
+        {
+            "player_id": ids("baseObjectId"),
+            "name": pd.Series([str(p.get("name") or "") for p in players], dtype=object),
+            "exclude_from_statistics": np.fromiter(
+                (bool(p.get("excludeFromStatistics") or False) for p in players), dtype=bool, count=len(players)
+            ),
+            "created_ts": ids("createdTimestamp"),
+            "updated_ts": ids("updatedTimestamp"),
+        }
     )
 
-    if "created_ts" in players_df.columns:
-        players_df["created_ts"] = pd.to_numeric(players_df["created_ts"], errors="coerce").astype("Int64")
-    if "updated_ts" in players_df.columns:
-        players_df["updated_ts"] = pd.to_numeric(players_df["updated_ts"], errors="coerce").astype("Int64")
-
-    return players_df.reset_index(drop=True)
+    return players_df
 
 
 def build_stats_from_matchstatistics(resp: Dict[str, Any]) -> pd.DataFrame:
-    ms = to_df(resp.get("matchStatistics", []))
+    ms = _records_df(resp, "matchStatistics")
     if ms.empty:
         return pd.DataFrame(columns=["player_id", "goals", "assists", "own_goals"])
 
@@ -137,37 +305,38 @@ def build_stats_from_matchstatistics(resp: Dict[str, Any]) -> pd.DataFrame:
     if player_col is None:
         return pd.DataFrame(columns=["player_id", "goals", "assists", "own_goals"])
 
-    ms[player_col] = pd.to_numeric(ms[player_col], errors="coerce").astype("Int64")
-
     def pick_flag(df: pd.DataFrame, names: tuple[str, ...]) -> pd.Series:
         for n in names:
             if n in df.columns:
-                return pd.to_numeric(df[n], errors="coerce").fillna(0).astype(int)
+                return df[n].fillna(0).astype(int)
         return pd.Series(0, index=df.index, dtype=int)
 
     goals = pick_flag(ms, ("score", "isGoal", "Score"))
     assists = pick_flag(ms, ("assist", "isAssist", "Assist"))
     own_goals = pick_flag(ms, ("ownGoal", "own_goal", "OwnGoal"))
 
-    ms["_pid"] = ms[player_col]
-
-    agg = (
-        ms.groupby("_pid", as_index=False)
-        .agg(
-            goals_sum=("score", lambda s: int(goals.loc[s.index].sum())),
-            assists_sum=("score", lambda s: int(assists.loc[s.index].sum())),
-            own_goals_sum=("score", lambda s: int(own_goals.loc[s.index].sum())),
-        )
-        .rename(columns={"_pid": "player_id"})
+    # Dense player index + bincount: one pass per flag over plain arrays,
+    # no per-group hash table or Python callback (rows without a player are dropped)
+    codes, player_ids = pd.factorize(ms[player_col], sort=True)
+    valid = codes >= 0
+    n_players = len(player_ids)
+
+    def per_player(flag: pd.Series) -> np.ndarray:
+        return np.bincount(codes[valid], weights=flag.to_numpy()[valid], minlength=n_players).astype("int64")
+
+    agg = pd.DataFrame(
+        {
+            "player_id": pd.array(player_ids, dtype="Int64"),
+            "goals": per_player(goals),
+            "assists": per_player(assists),
+            "own_goals": per_player(own_goals),
+        }
     )
-
-    agg["player_id"] = pd.to_numeric(agg["player_id"], errors="coerce").astype("Int64")
-    agg = agg.rename(columns={"goals_sum": "goals", "assists_sum": "assists", "own_goals_sum": "own_goals"})
-    return agg[["player_id", "goals", "assists", "own_goals"]]
+    return agg
 
 
 def build_matches_played_from_itemplayerhistory(resp: Dict[str, Any]) -> pd.DataFrame:
-    iph = to_df(resp.get("itemPlayerHistory", []))
+    iph = _records_df(resp, "itemPlayerHistory")
     if iph.empty:
         return pd.DataFrame(columns=["player_id", "matches_played"])
 
@@ -175,32 +344,29 @@ def build_matches_played_from_itemplayerhistory(resp: Dict[str, Any]) -> pd.Data
     if player_col is None:
         return pd.DataFrame(columns=["player_id", "matches_played"])
 
-    iph["player_id"] = pd.to_numeric(iph[player_col], errors="coerce").astype("Int64")
-
-    if "soccerMatchId" in iph.columns:
-        iph["soccer_match_id"] = pd.to_numeric(iph["soccerMatchId"], errors="coerce").astype("Int64")
-    else:
-        iph["soccer_match_id"] = pd.NA
-
-    iph["item_event_id_str"] = iph.get("itemEventId", "").astype(str).fillna("")
-
-    def choose_match_id(row):
-        sm = row["soccer_match_id"]
-        try:
-            if pd.notna(sm) and int(sm) != 0:
-                return f"s{int(sm)}"
-        except Exception:
-            pass
-        return f"ie{row['item_event_id_str']}"
-
-    iph["match_identifier"] = iph.apply(choose_match_id, axis=1)
-
-    mp = (
-        iph.groupby("player_id", as_index=False)["match_identifier"]
-        .nunique()
-        .rename(columns={"match_identifier": "matches_played"})
+    iph["player_id"] = iph[player_col]
+
+    sm = iph.get("soccerMatchId", pd.Series(pd.NA, index=iph.index, dtype="Int64"))
+    has_sm = (sm.notna() & (sm != 0)).to_numpy(dtype=bool, na_value=False)
+
+    # One int64 per match instead of an "s<id>"/"ie<id>" string: the soccerMatchId
+    # where it is set (> 0), else a negative code for the item event (-1 if missing)
+    ie_codes, _ = pd.factorize(iph.get("itemEventId", pd.Series(np.nan, index=iph.index)))
+    iph["match_id_int"] = np.where(has_sm, sm.fillna(0).to_numpy(dtype="int64"), -ie_codes.astype("int64") - 2)
+
+    # Distinct (player, match) pairs counted per player on dense codes: one int64
+    # key per pair, np.unique to dedup, np.bincount to count (rows without a
+    # player are dropped)
+    player_codes, player_ids = pd.factorize(iph["player_id"])
+    match_codes, match_ids = pd.factorize(iph["match_id_int"])
+    valid = player_codes >= 0
+    pairs = np.unique(player_codes[valid].astype("int64") * len(match_ids) + match_codes[valid])
+    mp = pd.DataFrame(
+        {
+            "player_id": pd.array(player_ids, dtype="Int64"),
+            "matches_played": np.bincount(pairs // len(match_ids), minlength=len(player_ids)).astype(int),
+        }
     )
-    mp["matches_played"] = mp["matches_played"].astype(int)
     return mp
 
 
@@ -212,7 +378,7 @@ def build_matches_df(resp: Dict[str, Any]) -> pd.DataFrame:
     Build a one-row-per-match table from matchScoreStatistics,
     using groupby().agg(...) instead of deprecated groupby.apply.
     """
-    mss = to_df(resp.get("matchScoreStatistics", []))
+    mss = _records_df(resp, "matchScoreStatistics")
     if mss.empty:
         return pd.DataFrame()
 
@@ -231,27 +397,12 @@ def build_matches_df(resp: Dict[str, Any]) -> pd.DataFrame:
         if c not in mss.columns:
             mss[c] = pd.NA
 
-    def make_match_key(row):
-        sm = row.get("soccerMatchId")
-        try:
-            if pd.notna(sm) and int(sm) != 0:
-                return f"s{int(sm)}"
-        except Exception:
-            pass
-        ie = row.get("itemEventId") or ""
-        th = row.get("teamHomeId") or ""
-        ta = row.get("teamAwayId") or ""
-        date = row.get("itemEventDate") or ""
-        return f"ie{ie}_h{th}_a{ta}_d{date}"
-
-    mss["match_key"] = mss.apply(make_match_key, axis=1)
-
-    mss["scoreTeamHome_num"] = pd.to_numeric(mss["scoreTeamHome"], errors="coerce")
-    mss["scoreTeamAway_num"] = pd.to_numeric(mss["scoreTeamAway"], errors="coerce")
+    mss["match_key"] = _mss_match_keys(mss)
 
+    # The "first" fields are the same on every row of a match, so the rows
+    # need no sorting beforehand (the scores take the max)
     grouped = (
-        mss.sort_values("itemEventDate")
-        .groupby("match_key", as_index=False)
+        mss.groupby("match_key", as_index=False)
         .agg(
             soccer_match_id=("soccerMatchId", "first"),
             item_event_id=("itemEventId", "first"),
@@ -260,48 +411,43 @@ def build_matches_df(resp: Dict[str, Any]) -> pd.DataFrame:
             team_away=("teamAway", "first"),
             team_home_id=("teamHomeId", "first"),
             team_away_id=("teamAwayId", "first"),
-            home_score=("scoreTeamHome_num", "max"),
-            away_score=("scoreTeamAway_num", "max"),
+            home_score=("scoreTeamHome", "max"),
+            away_score=("scoreTeamAway", "max"),
         )
     )
 
-    grouped["soccer_match_id"] = pd.to_numeric(grouped["soccer_match_id"], errors="coerce").astype("Int64")
+    grouped["soccer_match_id"] = grouped["soccer_match_id"].astype("Int64")
     grouped["home_score"] = grouped["home_score"].astype("Int64")
     grouped["away_score"] = grouped["away_score"].astype("Int64")
 
     return grouped
 
 
-def build_player_stats(resp: Dict[str, Any]) -> pd.DataFrame:
-    players_df = build_players_df(resp)
+def build_player_stats(resp: Dict[str, Any], players_df: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    One row per player, best scorers first (goals, then assists).
+    players_df: build_players_df(resp), if the caller already has it.
+    """
+    if players_df is None:
+        players_df = build_players_df(resp)
     agg_stats = build_stats_from_matchstatistics(resp)
     matches_played = build_matches_played_from_itemplayerhistory(resp)
 
-    df = players_df[["player_id", "name", "exclude_from_statistics"]].copy()
-
-    if not agg_stats.empty:
-        df = df.merge(agg_stats, on="player_id", how="left")
-    else:
-        df["goals"] = 0
-        df["assists"] = 0
-        df["own_goals"] = 0
+    # Both lookups are keyed on player_id: one join on the index instead of two merges
+    df = (
+        players_df.set_index("player_id")[["name", "exclude_from_statistics"]]
+        .join([agg_stats.set_index("player_id"), matches_played.set_index("player_id")], how="left")
+        .reset_index()
+    )
 
-    for c in ("goals", "assists", "own_goals"):
-        if c not in df.columns:
-            df[c] = 0
-    df[["goals", "assists", "own_goals"]] = df[["goals", "assists", "own_goals"]].fillna(0).astype(int)
-
-    if not matches_played.empty:
-        df = df.merge(matches_played, on="player_id", how="left")
-    else:
-        df["matches_played"] = 0
-    df["matches_played"] = df["matches_played"].fillna(0).astype(int)
+    counts = ["goals", "assists", "own_goals", "matches_played"]
+    df[counts] = df[counts].astype("Int64").fillna(0).astype(int)
 
     df = df.sort_values(by=["goals", "assists"], ascending=[False, False]).reset_index(drop=True)
     return df
 
 
-def build_scoring_events_df(resp: Dict[str, Any]) -> pd.DataFrame:
+def build_scoring_events_df(resp: Dict[str, Any], players_df: pd.DataFrame | None = None) -> pd.DataFrame:
     """
     Build a one-row-per-goal events table from matchScoreStatistics.
 
@@ -309,9 +455,11 @@ def build_scoring_events_df(resp: Dict[str, Any]) -> pd.DataFrame:
     - scorer + (optional) assist + (optional) own-goal player
     - match info (teams, date, current score)
     - time of the goal (scoreTime)
+
+    players_df: build_players_df(resp), if the caller already has it.
     """
 
-    mss = to_df(resp.get("matchScoreStatistics", []))
+    mss = _records_df(resp, "matchScoreStatistics")
     if mss.empty:
         return pd.DataFrame(
             columns=[
@@ -336,22 +484,50 @@ def build_scoring_events_df(resp: Dict[str, Any]) -> pd.DataFrame:
             ]
         )
 
-    # Normalise column names/types we need
-    mss["soccer_match_id"] = pd.to_numeric(mss.get("soccerMatchId"), errors="coerce").astype("Int64")
-    mss["item_event_id"] = pd.to_numeric(mss.get("itemEventId"), errors="coerce").astype("Int64")
-    mss["score_team_id"] = pd.to_numeric(mss.get("scoreTeamId"), errors="coerce").astype("Int64")
-    mss["team_home_id"] = pd.to_numeric(mss.get("teamHomeId"), errors="coerce").astype("Int64")
-    mss["team_away_id"] = pd.to_numeric(mss.get("teamAwayId"), errors="coerce").astype("Int64")
-
-    # These may be missing in some seasons, so be defensive
-    for col in ("scoreById", "assistById", "ownGoalById"):
+    # Id columns are already Int64 (_records_df); some may be missing in some
+    # seasons, so be defensive
+    for col in ("soccerMatchId", "itemEventId", "scoreTeamId", "teamHomeId", "teamAwayId",
+                "scoreById", "assistById", "ownGoalById"):
         if col not in mss.columns:
-            mss[col] = pd.NA
-        mss[col] = pd.to_numeric(mss[col], errors="coerce").astype("Int64")
+            mss[col] = pd.Series(pd.NA, index=mss.index, dtype="Int64")
+    if "itemEventDate" not in mss.columns:
+        mss["itemEventDate"] = pd.NA
+
+    # Player positions per role (scorer / assist / own goal), from one
+    # player_id -> name lookup instead of three merges that each rebuild a
+    # hash table and copy the whole events frame. Keys are plain int64
+    # (missing ids -> -1, never a player id); -1 = unknown player.
+    if players_df is None:
+        players_df = build_players_df(resp)
+    players = players_df.dropna(subset=["player_id"]).drop_duplicates("player_id")
+    player_index = pd.Index(players["player_id"].to_numpy(dtype="int64"))
+    roles = {"scorer": "scoreById", "assist": "assistById", "own_goal": "ownGoalById"}
+    positions = {
+        role: player_index.get_indexer(mss[id_col].fillna(-1).to_numpy(dtype="int64"))
+        for role, id_col in roles.items()
+    }
+
+    # Optional: filter to "real goals" (i.e. something actually happened)
+    # Keep rows where there is a scorer or an own-goal player. Done first, so
+    # everything below only touches the goal rows.
+    mask_goal = (positions["scorer"] >= 0) | (positions["own_goal"] >= 0)
+    mss = mss[mask_goal].reset_index(drop=True)
+    positions = {role: pos[mask_goal] for role, pos in positions.items()}
+
+    # Same match_key as build_matches_df(), built column-wise
+    mss["match_key"] = _mss_match_keys(mss)
+
+    # Normalise column names we need
+    mss["soccer_match_id"] = mss["soccerMatchId"]
+    mss["item_event_id"] = mss["itemEventId"]
+    mss["score_team_id"] = mss["scoreTeamId"]
+    mss["team_home_id"] = mss["teamHomeId"]
+    mss["team_away_id"] = mss["teamAwayId"]
 
     # Keep a clean subset & rename
     events = mss[
         [
+            "match_key",
             "itemEventDate",
             "scoreTime",
             "soccer_match_id",
@@ -380,41 +556,13 @@ def build_scoring_events_df(resp: Dict[str, Any]) -> pd.DataFrame:
         }
     )
 
-    # Build a match_key compatible with build_matches_df()
-    def make_match_key(row):
-        sm = row["soccer_match_id"]
-        try:
-            if pd.notna(sm) and int(sm) != 0:
-                return f"s{int(sm)}"
-        except Exception:
-            pass
-        ie = row["item_event_id"]
-        th = row["team_home_id"]
-        ta = row["team_away_id"]
-        date = row["item_event_date"]
-        return f"ie{ie}_h{th}_a{ta}_d{date}"
-
-    events["match_key"] = events.apply(make_match_key, axis=1)
-
-    # Attach player names (scorer / assist / own goal) using players list
-    players_df = build_players_df(resp)[["player_id", "name"]]
-
-    scorer = players_df.rename(columns={"player_id": "scorer_id", "name": "scorer_name"})
-    assist = players_df.rename(columns={"player_id": "assist_id", "name": "assist_name"})
-    own_g = players_df.rename(columns={"player_id": "own_goal_id", "name": "own_goal_name"})
-
-    events = events.merge(
-        scorer, left_on="scoreById", right_on="scorer_id", how="left"
-    ).merge(
-        assist, left_on="assistById", right_on="assist_id", how="left"
-    ).merge(
-        own_g, left_on="ownGoalById", right_on="own_goal_id", how="left"
-    )
-
-    # Optional: filter to "real goals" (i.e. something actually happened)
-    # Keep rows where there is a scorer or an own-goal player
-    mask_goal = events["scorer_id"].notna() | events["own_goal_id"].notna()
-    events = events[mask_goal].reset_index(drop=True)
+    # Attach player ids + names; trailing NaN: position -1 (unknown player) picks it
+    names = np.append(players["name"].to_numpy(dtype=object), np.nan)
+    for role, id_col in roles.items():
+        pos = positions[role]
+        # <role>_id is only set for known players, like the former left merge
+        events[f"{role}_id"] = events[id_col].where(pos >= 0)
+        events[f"{role}_name"] = names[pos]
 
     # Final column order
     cols_order = [
@@ -447,6 +595,56 @@ def build_scoring_events_df(resp: Dict[str, Any]) -> pd.DataFrame:
 # -------------------------------------------------
 # MAIN: process both seasons, add `season`, combine
 # -------------------------------------------------
+def _log_table(title: str, df: pd.DataFrame, empty_msg: str) -> None:
+    """Debug-log the top 10 rows of df; nothing is formatted unless DEBUG is enabled."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if df.empty:
+        logger.debug("\n%s\n%s", title, empty_msg)
+        return
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        logger.debug("\n%s\n%s", title, df.head(10).to_string(index=False))
+
+
+def process_season(season: str, cfg: Dict[str, Any], allow_download: bool):
+    """
+    Load (or download) one season and build its tables.
+    Returns (player_stats, matches_df, events_df) with a `season` column, or None if there is no data.
+    """
+    # A download rewrites the local file first, which moves its cache key
+    data = None
+    if allow_download:
+        data = download_season_json(season, cfg["url"], cfg["file"], allow_download=True)
+
+    # Unchanged season file: reuse the tables built from it, skipping parse + build
+    cache_file = _tables_cache_file(cfg["file"])
+    tables = _load_cached_tables(cache_file)
+    if tables is None:
+        if data is None:
+            data = download_season_json(season, cfg["url"], cfg["file"], allow_download=False)
+        if data is None:
+            return None
+
+        # Parse + type the shared record lists once for all builders
+        resp = _canonicalize_resp(data.get("response", data))
+
+        print(f"\n--- Building tables for season {season} ---")
+        players_df = build_players_df(resp)
+        tables = (
+            build_player_stats(resp, players_df=players_df),
+            build_matches_df(resp),
+            build_scoring_events_df(resp, players_df=players_df),
+        )
+        # Arrow-backed columns instead of Python objects / boxed Int64:
+        # less memory, and the concat in main works on Arrow buffers
+        tables = tuple(df.convert_dtypes(dtype_backend="pyarrow") for df in tables)
+        _save_cached_tables(cache_file, tables)
+
+    for df in tables:
+        df["season"] = pd.Series(season, index=df.index, dtype=pd.ArrowDtype(pa.string()))
+    return tables
+
+
 def main(download_2526: bool = False):
     """
     Build combined tables for all seasons.
@@ -455,54 +653,32 @@ def main(download_2526: bool = False):
     - Season 25/26:
         * If download_2526=True  -> try to download & update local file, fallback to local.
         * If download_2526=False -> use local file only.
+
+    Seasons are independent, so they are processed in parallel threads
+    (the 25/26 download overlaps with building 24/25).
     """
     all_player_stats = []
     all_matches = []
     all_events = []
 
-    for season, cfg in SEASONS.items():
-        if season == "24/25":
-            allow_download = False
-        elif season == "25/26":
-            allow_download = download_2526
-        else:
-            allow_download = False
+    def allow_download(season: str) -> bool:
+        return season == "25/26" and download_2526
 
-        data = download_season_json(season, cfg["url"], cfg["file"], allow_download=allow_download)
-        if data is None:
+    with ThreadPoolExecutor(max_workers=len(SEASONS)) as ex:
+        futures = {
+            season: ex.submit(process_season, season, cfg, allow_download(season))
+            for season, cfg in SEASONS.items()
+        }
+        results = {season: future.result() for season, future in futures.items()}
+
+    for season, tables in results.items():
+        if tables is None:
             continue
+        player_stats, matches_df, events_df = tables
 
-        resp = data.get("response", data)
-
-        print(f"\n--- Building tables for season {season} ---")
-        player_stats = build_player_stats(resp)
-        matches_df = build_matches_df(resp)
-        events_df = build_scoring_events_df(resp)
-
-        player_stats["season"] = season
-        matches_df["season"] = season
-        events_df["season"] = season
-
-        print("\nplayer_stats (top 10):")
-        if not player_stats.empty:
-            with pd.option_context("display.max_columns", None, "display.width", 200):
-                print(player_stats.head(10).to_string(index=False))
-        else:
-            print("<no player stats>")
-
-        print("\nmatches_df (top 10):")
-        if not matches_df.empty:
-            with pd.option_context("display.max_columns", None, "display.width", 200):
-                print(matches_df.head(10).to_string(index=False))
-        else:
-            print("<no matches>")
-
-        print("\nscoring_events_df (top 10):")
-        if not events_df.empty:
-            with pd.option_context("display.max_columns", None, "display.width", 200):
-                print(events_df.head(10).to_string(index=False))
-        else:
-            print("<no scoring events>")
+        _log_table(f"player_stats {season} (top 10):", player_stats, "<no player stats>")
+        _log_table(f"matches_df {season} (top 10):", matches_df, "<no matches>")
+        _log_table(f"scoring_events_df {season} (top 10):", events_df, "<no scoring events>")
 
         all_player_stats.append(player_stats)
         all_matches.append(matches_df)
@@ -523,26 +699,9 @@ def main(download_2526: bool = False):
     else:
         events_all = pd.DataFrame()
         
-    print("\n=== COMBINED player_stats_all (top 10) ===")
-    if not player_stats_all.empty:
-        with pd.option_context("display.max_columns", None, "display.width", 200):
-            print(player_stats_all.head(10).to_string(index=False))
-    else:
-        print("<empty>")
-
-    print("\n=== COMBINED matches_all (top 10) ===")
-    if not matches_all.empty:
-        with pd.option_context("display.max_columns", None, "display.width", 200):
-            print(matches_all.head(10).to_string(index=False))
-    else:
-        print("<empty>")
-
-    print("\n=== COMBINED scoring_events_all (top 10) ===")
-    if not events_all.empty:
-        with pd.option_context("display.max_columns", None, "display.width", 200):
-            print(events_all.head(10).to_string(index=False))
-    else:
-        print("<empty>")
+    _log_table("=== COMBINED player_stats_all (top 10) ===", player_stats_all, "<empty>")
+    _log_table("=== COMBINED matches_all (top 10) ===", matches_all, "<empty>")
+    _log_table("=== COMBINED scoring_events_all (top 10) ===", events_all, "<empty>")
 
     return {
         "player_stats_all": player_stats_all,
@@ -552,5 +711,7 @@ def main(download_2526: bool = False):
 
 
 if __name__ == "__main__":
+    # Running the file directly shows the table previews (debug log)
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     # If you run this file directly, you can choose whether to download 25/26
     main(download_2526=True)